@@ -44,29 +44,53 @@ Implementation Notes
 
 """
 import time
-from struct import pack
+from array import array
+from struct import pack_into, unpack_from
 from micropython import const
 from adafruit_bus_device.i2c_device import I2CDevice
-from adafruit_binascii import hexlify
 
 __version__ = "0.0.0-auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_ATECC.git"
 
 # Device Address
 _REG_ATECC_ADDR = const(0xC0)
-_REG_ATECC_DEVICE_ADDR = _REG_ATECC_ADDR >> 1
+_REG_ATECC_DEVICE_ADDR = const(_REG_ATECC_ADDR >> 1)
 
 # Version Registers
 _ATECC_508_VER = const(0x50)
 _ATECC_608_VER = const(0x60)
 
 # Clock constants
-_WAKE_CLK_FREQ = 100000    # slower clock speed
+_WAKE_CLK_FREQ = const(100000)    # slower clock speed
 _TWLO_TIME = 6e-5          # TWlo, in microseconds
+_TWHI_TIME = 1.5e-3        # TWhi, in seconds
+# CircuitPython rounds sleeps down to whole milliseconds, so the
+# sub-millisecond polling steps there are immediate retries
+_POLL_MIN_TIME = 1e-4      # first response polling interval, in seconds
+_POLL_TIME = 0.001         # longest response polling interval, in seconds
+_POLL_MARGIN = const(5)    # polling time past the maximum execution time, in ms
+
+# monotonic_ns keeps its resolution over long uptimes, but it is
+# only available on builds with long int support
+if hasattr(time, "monotonic_ns"):
+    _monotonic = time.monotonic_ns
+    _TWATCHDOG = 700000000          # TWatchdog (minimum), in nanoseconds
+    _TWATCHDOG_MARGIN = 150000000   # longest command (GenKey) plus bus time, in nanoseconds
+    _CLOCK_MS = 1000000             # clock ticks per millisecond
+else:
+    _monotonic = time.monotonic
+    _TWATCHDOG = 0.7                # TWatchdog (minimum), in seconds
+    _TWATCHDOG_MARGIN = 0.15        # longest command (GenKey) plus bus time, in seconds
+    _CLOCK_MS = 0.001               # clock ticks per millisecond
+
+# Packet sizes, in bytes
+_MAX_COMMAND_LEN = const(72)   # 8 byte header/CRC, up to 64 bytes data
+_MAX_RESPONSE_LEN = const(67)  # 1 byte count, up to 64 bytes data, 2 bytes CRC
 
 # Command Opcodes (9-1-3)
 OP_COUNTER = const(0x24)
 OP_INFO = const(0x30)
+OP_READ = const(0x02)
 OP_NONCE = const(0x16)
 OP_RANDOM = const(0x1B)
 OP_SHA = const(0x47)
@@ -78,6 +102,7 @@ OP_WRITE = const(0x12)
 # Maximum execution times, in milliseconds (9-4)
 EXEC_TIME = {OP_COUNTER: const(20),
              OP_INFO: const(1),
+             OP_READ: const(5),
              OP_NONCE: const(7),
              OP_RANDOM: const(23),
              OP_SHA: const(47),
@@ -87,6 +112,72 @@ EXEC_TIME = {OP_COUNTER: const(20),
              OP_WRITE : const(26)}
 
 
+# Byte-wise CRC-16 lookup table for polynomial 0x8005 in reflected (LSB-first)
+# form (0xA001)
+_CRC_TABLE = array("H", (
+    0x0000, 0xC0C1, 0xC181, 0x0140, 0xC301, 0x03C0, 0x0280, 0xC241,
+    0xC601, 0x06C0, 0x0780, 0xC741, 0x0500, 0xC5C1, 0xC481, 0x0440,
+    0xCC01, 0x0CC0, 0x0D80, 0xCD41, 0x0F00, 0xCFC1, 0xCE81, 0x0E40,
+    0x0A00, 0xCAC1, 0xCB81, 0x0B40, 0xC901, 0x09C0, 0x0880, 0xC841,
+    0xD801, 0x18C0, 0x1980, 0xD941, 0x1B00, 0xDBC1, 0xDA81, 0x1A40,
+    0x1E00, 0xDEC1, 0xDF81, 0x1F40, 0xDD01, 0x1DC0, 0x1C80, 0xDC41,
+    0x1400, 0xD4C1, 0xD581, 0x1540, 0xD701, 0x17C0, 0x1680, 0xD641,
+    0xD201, 0x12C0, 0x1380, 0xD341, 0x1100, 0xD1C1, 0xD081, 0x1040,
+    0xF001, 0x30C0, 0x3180, 0xF141, 0x3300, 0xF3C1, 0xF281, 0x3240,
+    0x3600, 0xF6C1, 0xF781, 0x3740, 0xF501, 0x35C0, 0x3480, 0xF441,
+    0x3C00, 0xFCC1, 0xFD81, 0x3D40, 0xFF01, 0x3FC0, 0x3E80, 0xFE41,
+    0xFA01, 0x3AC0, 0x3B80, 0xFB41, 0x3900, 0xF9C1, 0xF881, 0x3840,
+    0x2800, 0xE8C1, 0xE981, 0x2940, 0xEB01, 0x2BC0, 0x2A80, 0xEA41,
+    0xEE01, 0x2EC0, 0x2F80, 0xEF41, 0x2D00, 0xEDC1, 0xEC81, 0x2C40,
+    0xE401, 0x24C0, 0x2580, 0xE541, 0x2700, 0xE7C1, 0xE681, 0x2640,
+    0x2200, 0xE2C1, 0xE381, 0x2340, 0xE101, 0x21C0, 0x2080, 0xE041,
+    0xA001, 0x60C0, 0x6180, 0xA141, 0x6300, 0xA3C1, 0xA281, 0x6240,
+    0x6600, 0xA6C1, 0xA781, 0x6740, 0xA501, 0x65C0, 0x6480, 0xA441,
+    0x6C00, 0xACC1, 0xAD81, 0x6D40, 0xAF01, 0x6FC0, 0x6E80, 0xAE41,
+    0xAA01, 0x6AC0, 0x6B80, 0xAB41, 0x6900, 0xA9C1, 0xA881, 0x6840,
+    0x7800, 0xB8C1, 0xB981, 0x7940, 0xBB01, 0x7BC0, 0x7A80, 0xBA41,
+    0xBE01, 0x7EC0, 0x7F80, 0xBF41, 0x7D00, 0xBDC1, 0xBC81, 0x7C40,
+    0xB401, 0x74C0, 0x7580, 0xB541, 0x7700, 0xB7C1, 0xB681, 0x7640,
+    0x7200, 0xB2C1, 0xB381, 0x7340, 0xB101, 0x71C0, 0x7080, 0xB041,
+    0x5000, 0x90C1, 0x9181, 0x5140, 0x9301, 0x53C0, 0x5280, 0x9241,
+    0x9601, 0x56C0, 0x5780, 0x9741, 0x5500, 0x95C1, 0x9481, 0x5440,
+    0x9C01, 0x5CC0, 0x5D80, 0x9D41, 0x5F00, 0x9FC1, 0x9E81, 0x5E40,
+    0x5A00, 0x9AC1, 0x9B81, 0x5B40, 0x9901, 0x59C0, 0x5880, 0x9841,
+    0x8801, 0x48C0, 0x4980, 0x8941, 0x4B00, 0x8BC1, 0x8A81, 0x4A40,
+    0x4E00, 0x8EC1, 0x8F81, 0x4F40, 0x8D01, 0x4DC0, 0x4C80, 0x8C41,
+    0x4400, 0x84C1, 0x8581, 0x4540, 0x8701, 0x47C0, 0x4680, 0x8641,
+    0x8201, 0x42C0, 0x4380, 0x8341, 0x4100, 0x81C1, 0x8081, 0x4040,
+))
+
+def _at_crc(data, length=None):
+    """Calculates the CRC-16 of the first length bytes of data."""
+    if length is None:
+        length = len(data)
+    if not data or not length:
+        return 0
+    if length < len(data):
+        data = memoryview(data)[:length]
+    # Data bits are clocked in LSB-first, so run the table in the
+    # reflected domain and reverse the 16-bit result once at the end.
+    crc = 0x0
+    table = _CRC_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    crc = ((crc >> 1) & 0x5555) | ((crc & 0x5555) << 1)
+    crc = ((crc >> 2) & 0x3333) | ((crc & 0x3333) << 2)
+    crc = ((crc >> 4) & 0x0F0F) | ((crc & 0x0F0F) << 4)
+    return ((crc >> 8) | (crc << 8)) & 0xFFFF
+
+# Precomputed packets for commands without variable parameters,
+# word address, count, opcode, param1, param2 (2 bytes), CRC (2 bytes)
+_CMD_INFO_REVISION = b"\x03\x07\x30\x00\x00\x00\x03\x5d"
+_CMD_RANDOM = b"\x03\x07\x1b\x00\x00\x00\x24\xcd"
+_CMD_SHA_START = b"\x03\x07\x47\x00\x00\x00\x2e\x85"
+_CMD_SHA_END = b"\x03\x07\x47\x02\x00\x00\x2d\x00"
+# word address only
+_CMD_SLEEP = b"\x01"
+_CMD_IDLE = b"\x02"
+
 CFG_TLS = b'\x01#\x00\x00\x00\x00P\x00\x00\x00\x00\x00\x00\xc0q\x00\xc0\x00U\x00\x83 \x87 \x87 \x87/\x87/\x8f\x8f\x9f\x8f\xaf\x8f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xaf\x8f\xff\xff\xff\xff\x00\x00\x00\x00\xff\xff\xff\xff\x00\x00\x00\x00\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\xff\x00\x00UU\xff\xff\x00\x00\x00\x00\x00\x003\x003\x003\x003\x003\x00\x1c\x00\x1c\x00\x1c\x00<\x00<\x00<\x00<\x00<\x00<\x00<\x00\x1c\x00'
 
 class ATECC:
@@ -101,9 +192,16 @@ class ATECC:
 
         """
         self._debug = debug
-        self._i2cbuf = bytearray(12)
+        self._cmd_buf = bytearray(_MAX_COMMAND_LEN)
+        self._resp_buf = bytearray(_MAX_RESPONSE_LEN)
         self._i2c_bus = i2c_bus
         self._i2c_device = None
+        self._awake = False
+        self._awake_deadline = 0
+        self._session_depth = 0
+        self._version = None
+        self._serial_number = None
+        self._locked = False
         self.wakeup()
         if not self._i2c_device:
             self._i2c_device = I2CDevice(self._i2c_bus, address)
@@ -115,90 +213,116 @@ class ATECC:
         """Wakes up THE ATECC608A from sleep or idle modes.
         Returns True if device woke up from sleep/idle mode.
         """
+        # skip the wake sequence if the watchdog can't have expired yet
+        if self._awake:
+            if _monotonic() < self._awake_deadline:
+                return
+            # idle restarts the watchdog without losing TempKey/SHA state
+            try:
+                self.idle()
+            except OSError:
+                self._awake = False
         while not self._i2c_bus.try_lock():
-            pass
-        # check if it exists, first
-        if 0x60 in self._i2c_bus.scan():
+            time.sleep(0)   # let background tasks run while the bus is busy
+        # check if it is already awake, first
+        try:
+            self._i2c_bus.writeto(_REG_ATECC_DEVICE_ADDR, b"")
             self._i2c_bus.unlock()
             return
+        except OSError:
+            pass    # asleep or idle, no ACK
         zero_bits = bytearray(2)
         try:
             self._i2c_bus.writeto(0x0, zero_bits)
         except OSError:
             pass    # this may fail, that's ok - its just to wake up the chip!
         time.sleep(_TWLO_TIME)
-        data = self._i2c_bus.scan()         # check for an i2c device
-
-        try:
-            if data[0] != 96:
-                raise TypeError('ATECCx08 not found - please check your wiring!')
-        except IndexError:
-            raise IndexError("ATECCx08 not found - please check your wiring!")
         self._i2c_bus.unlock()
+        # the chip doesn't answer until TWhi after the wake pulse,
+        # and I2CDevice probes the address when it's created
+        time.sleep(_TWHI_TIME)
         if not self._i2c_device:
             self._i2c_device = I2CDevice(self._i2c_bus, _REG_ATECC_DEVICE_ADDR, debug=False)
         # check if we are ready to read from
         r = bytearray(1)
-        self._get_response(r)
+        try:
+            self._get_response(r)
+        except RuntimeError:
+            raise RuntimeError("ATECCx08 not found - please check your wiring!")
         if r[0] != 0x11:
             raise RuntimeError("Failed to wakeup")
+        self._awake = True
+        # leave room for a command to finish before the watchdog fires
+        self._awake_deadline = _monotonic() + _TWATCHDOG - _TWATCHDOG_MARGIN
 
     def idle(self):
         """Puts the chip into idle mode
         until wakeup is called.
         """
-        self._i2cbuf[0] = 0x2
         with self._i2c_device as i2c:
-            i2c.write(self._i2cbuf, end=1)
+            i2c.write(_CMD_IDLE)
+        self._awake = False
         time.sleep(0.001)
 
     def sleep(self):
         """Puts the chip into low-power
         sleep mode until wakeup is called.
         """
-        self._i2cbuf[0] = 0x1
         with self._i2c_device as i2c:
-            i2c.write(self._i2cbuf, end=1)
+            i2c.write(_CMD_SLEEP)
+        self._awake = False
         time.sleep(0.001)
 
+    def __enter__(self):
+        """Keeps the chip awake across the commands issued within
+        a ``with`` block, instead of idling it after each one.
+        Blocks can be nested, the chip idles when the outermost one exits.
+        """
+        self.wakeup()
+        self._session_depth += 1
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._session_depth -= 1
+        if not self._session_depth:
+            self.idle()
+
+    def _end_command(self):
+        # idle between commands, unless a session keeps the chip awake
+        if not self._session_depth:
+            self.idle()
+
     @property
     def locked(self):
         """Returns if the ATECC is locked."""
+        # locking can't be undone, so only a locked chip is cached
+        if self._locked:
+            return True
         config = bytearray(4)
         self._read(0x00, 0x15, config)
-        time.sleep(0.001)
-        return config[2] == 0x0 and config[3] == 0x00
+        self._locked = config[2] == 0x0 and config[3] == 0x00
+        return self._locked
 
     @property
     def serial_number(self):
         """Returns the ATECC serial number."""
-        serial_num = bytearray(9)
-        # 4-byte reads only
-        temp_sn = bytearray(4)
-        # SN<0:3>
-        self._read(0, 0x00, temp_sn)
-        serial_num[0:4] = temp_sn
-        time.sleep(0.001)
-        # SN<4:8>
-        self._read(0, 0x02, temp_sn)
-        serial_num[4:8] = temp_sn
-        time.sleep(0.001)
-        # Append Rev
-        self._read(0, 0x03, temp_sn)
-        serial_num[8] = temp_sn[0]
-        time.sleep(0.001)
+        # the serial number is fixed at manufacture, only read it once
+        if self._serial_number is not None:
+            return self._serial_number
+        # config block 0 holds SN<0:3>, RevNum, SN<4:8>
+        block = bytearray(32)
+        self._read(0, 0x00, block)
+        serial_num = block[0:4] + block[8:13]
         # neaten up the serial for printing
-        serial_num = hexlify(serial_num).decode("utf-8")
-        serial_num = str(serial_num).upper()
-        return serial_num
+        self._serial_number = ("%02X" * len(serial_num)) % tuple(serial_num)
+        return self._serial_number
 
     def version(self):
         """Returns the ATECC608As revision number"""
-        self.wakeup()
-        self.idle()
-        vers = bytearray(4)
-        vers = self.info(0x00)
-        return (vers[2] << 8) | vers[3]
+        if self._version is None:
+            vers = self.info(0x00)
+            self._version = (vers[2] << 8) | vers[3]
+        return self._version
 
     def lock_all_zones(self):
         """Locks Config, Data and OTP Zones."""
@@ -211,12 +335,12 @@ class ATECC:
         :param int zone: ATECC zone to lock.
         """
         self.wakeup()
-        self._send_command(0x17, 0x80 | zone, 0x0000)
-        time.sleep(EXEC_TIME[OP_LOCK]/1000)
         res = bytearray(1)
-        self._get_response(res)
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_LOCK, 0x80 | zone, 0x0000)
+            self._wait_response(i2c, res, EXEC_TIME[OP_LOCK])
         assert res[0] == 0x00, "Failed locking ATECC!"
-        self.idle()
+        self._end_command()
 
 
     def info(self, mode, param=None):
@@ -225,14 +349,17 @@ class ATECC:
 
         """
         self.wakeup()
-        if not param:
-            self._send_command(OP_INFO, mode)
-        else:
-            self._send_command(OP_INFO, mode, param)
-        time.sleep(EXEC_TIME[OP_INFO]/1000)
         info_out = bytearray(4)
-        self._get_response(info_out)
-        self.idle()
+        with self._i2c_device as i2c:
+            if not param:
+                if mode == 0x00:
+                    self._send_raw(i2c, _CMD_INFO_REVISION)
+                else:
+                    self._send_command(i2c, OP_INFO, mode)
+            else:
+                self._send_command(i2c, OP_INFO, mode, param)
+            self._wait_response(i2c, info_out, EXEC_TIME[OP_INFO])
+        self._end_command()
         return info_out
 
     def nonce(self, data, mode=0, zero=0x0000):
@@ -243,27 +370,25 @@ class ATECC:
         :param int zero: Param2, see Table 9-35.
 
         """
-        self.wakeup()
         if mode in (0x00, 0x01):
             if zero == 0x00:
                 assert len(data) == 20, "Data value must be 20 bytes long."
-            self._send_command(OP_NONCE, mode, zero, data)
             # nonce returns 32 bytes
             calculated_nonce = bytearray(32)
         elif mode == 0x03:
             # Operating in Nonce pass-through mode
             assert len(data) == 32, "Data value must be 32 bytes long."
-            self._send_command(OP_NONCE, mode, zero, data)
             # nonce returns 1 byte
             calculated_nonce = bytearray(1)
         else:
             raise RuntimeError("Invalid mode specified!")
-        time.sleep(EXEC_TIME[OP_NONCE]/1000)
-        self._get_response(calculated_nonce)
-        time.sleep(1/1000)
+        self.wakeup()
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_NONCE, mode, zero, data)
+            self._wait_response(i2c, calculated_nonce, EXEC_TIME[OP_NONCE])
         if mode == 0x03:
             assert calculated_nonce[0] == 0x00, "Incorrectly calculated nonce in pass-thru mode"
-        self.idle()
+        self._end_command()
         return calculated_nonce
 
 
@@ -275,57 +400,61 @@ class ATECC:
         :param bool increment_counter: Increments the value of the counter specified.
 
         """
-        counter = 0x00
+        counter_id = 1 if counter else 0
+        mode = 0x01 if increment_counter else 0x00
         self.wakeup()
-        if counter == 1:
-            counter = 0x01
-        if increment_counter:
-            self._send_command(OP_COUNTER, 0x01, counter)
-        else:
-            self._send_command(OP_COUNTER, 0x00, counter)
-        time.sleep(EXEC_TIME[OP_COUNTER]/1000)
         count = bytearray(4)
-        self._get_response(count)
-        self.idle()
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_COUNTER, mode, counter_id)
+            self._wait_response(i2c, count, EXEC_TIME[OP_COUNTER])
+        self._end_command()
         return count
 
     def random(self, rnd_min=0, rnd_max=0):
         """Generates a random number for use by the system.
         :param int rnd_min: Minimum Random value to generate.
-        :param int rnd_max: Maximum random value to generate.
+        :param int rnd_max: Maximum random value to generate, exclusive.
 
         """
-        if rnd_max:
-            rnd_min = 0
         if rnd_min >= rnd_max:
             return rnd_min
         delta = rnd_max - rnd_min
-        r = bytes(16)
-        r = self._random(r)
-        data = 0
-        for i in enumerate(r):
-            data += r[i]
-        if data < 0:
-            data = -data
-        data = data % delta
-        return data + rnd_min
+        # draw only the bits delta needs, so values stay small ints
+        # on builds without long int support
+        mask = 0
+        while mask < delta - 1:
+            mask = (mask << 1) | 1
+        r_len = 1
+        while mask >> (8 * r_len):
+            r_len += 1
+        r = bytearray(r_len)
+        while True:
+            self._random(r)
+            r[0] &= mask >> (8 * (r_len - 1))
+            # reject values past delta so every result is equally likely
+            data = int.from_bytes(r, "big")
+            if data < delta:
+                return data + rnd_min
 
     def _random(self, data):
         """Initializes the random number generator and returns.
         :param bytearray data: Response buffer.
 
         """
-        self.wakeup()
         data_len = len(data)
+        offset = 0
+        resp = bytearray(32)
+        resp_mv = memoryview(resp)
         while data_len:
-            self._send_command(OP_RANDOM, 0x00, 0x0000)
-            time.sleep(EXEC_TIME[OP_RANDOM]/1000)
-            resp = bytearray(32)
-            self._get_response(resp)
+            self.wakeup()
+            with self._i2c_device as i2c:
+                self._send_raw(i2c, _CMD_RANDOM)
+                self._wait_response(i2c, resp, EXEC_TIME[OP_RANDOM])
             copy_len = min(32, data_len)
-            data = resp[0:copy_len]
+            data[offset:offset+copy_len] = resp_mv[0:copy_len]
+            offset += copy_len
             data_len -= copy_len
-        self.idle()
+        self._end_command()
         return data
 
     # SHA-256 Commands
@@ -335,30 +464,32 @@ class ATECC:
         This method MUST be called before sha_update or sha_digest
         """
         self.wakeup()
-        self._send_command(OP_SHA, 0x00)
-        time.sleep(EXEC_TIME[OP_SHA]/1000)
         status = bytearray(1)
-        self._get_response(status)
+        with self._i2c_device as i2c:
+            self._send_raw(i2c, _CMD_SHA_START)
+            self._wait_response(i2c, status, EXEC_TIME[OP_SHA])
         assert status[0] == 0x00, "Error during sha_start."
-        self.idle()
+        self._end_command()
         return status
 
     def sha_update(self, message):
         """Appends bytes to the message. Can be repeatedly called.
-        :param bytes message: Up to 64 bytes of data to be included
-                                into the hash operation.
+        :param bytes message: Data to be included into the hash operation,
+                                a non-zero multiple of 64 bytes long.
 
         """
-        if not hasattr(message, "append"):
-            message = pack("B", message)
-        self.wakeup()
-        assert len(message) == 64, "Message provided to sha_update must be 64 bytes"
-        self._send_command(OP_SHA, 0x01, 64, message)
-        time.sleep(EXEC_TIME[OP_SHA]/1000)
+        message_len = len(message)
+        assert message_len and message_len % 64 == 0, (
+            "Message provided to sha_update must be a non-zero multiple of 64 bytes")
+        message = memoryview(message)
         status = bytearray(1)
-        self._get_response(status)
-        assert status[0] == 0x00, "Error during SHA Update"
-        self.idle()
+        for i in range(0, message_len, 64):
+            self.wakeup()
+            with self._i2c_device as i2c:
+                self._send_command(i2c, OP_SHA, 0x01, 64, message[i:i+64])
+                self._wait_response(i2c, status, EXEC_TIME[OP_SHA])
+            assert status[0] == 0x00, "Error during SHA Update"
+        self._end_command()
         return status
 
 
@@ -369,19 +500,19 @@ class ATECC:
                                     into the hash operation.
 
         """
-        if not hasattr(message, "append") and message is not None:
-            message = pack("B", message)
+        if isinstance(message, int):
+            message = bytes((message,))
         self.wakeup()
-        # Include optional message
-        if message:
-            self._send_command(OP_SHA, 0x02, len(message), message)
-        else:
-            self._send_command(OP_SHA, 0x02)
-        time.sleep(EXEC_TIME[OP_SHA]/1000)
         digest = bytearray(32)
-        self._get_response(digest)
+        with self._i2c_device as i2c:
+            # Include optional message
+            if message:
+                self._send_command(i2c, OP_SHA, 0x02, len(message), message)
+            else:
+                self._send_raw(i2c, _CMD_SHA_END)
+            self._wait_response(i2c, digest, EXEC_TIME[OP_SHA])
         assert len(digest) == 32, "SHA response length does not match expected length."
-        self.idle()
+        self._end_command()
         return digest
 
 
@@ -393,14 +524,13 @@ class ATECC:
         """
         assert 0 <= slot_num <= 4, "Provided slot must be between 0 and 4."
         self.wakeup()
-        if private_key:
-            self._send_command(OP_GEN_KEY, 0x04, slot_num)
-        else:
-            self._send_command(OP_GEN_KEY, 0x00, slot_num)
-        time.sleep(EXEC_TIME[OP_GEN_KEY]/1000)
-        self._get_response(key)
-        time.sleep(0.001)
-        self.idle()
+        with self._i2c_device as i2c:
+            if private_key:
+                self._send_command(i2c, OP_GEN_KEY, 0x04, slot_num)
+            else:
+                self._send_command(i2c, OP_GEN_KEY, 0x00, slot_num)
+            self._wait_response(i2c, key, EXEC_TIME[OP_GEN_KEY])
+        self._end_command()
         return key
 
     def ecdsa_sign(self, slot, message):
@@ -412,20 +542,18 @@ class ATECC:
         # Load the message digest into TempKey using Nonce (9.1.8)
         self.nonce(message, 0x03)
         # Generate and return a signature
-        sig = bytearray(64)
-        sig = self.sign(slot)
-        return sig
+        return self.sign(slot)
 
     def sign(self, slot_id):
         """Performs ECDSA signature calculation with key in provided slot.
         :param int slot_id: ECC slot containing key for use with signature.
         """
         self.wakeup()
-        self._send_command(0x41, 0x80, slot_id)
-        time.sleep(EXEC_TIME[OP_SIGN]/1000)
         signature = bytearray(64)
-        self._get_response(signature)
-        self.idle()
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_SIGN, 0x80, slot_id)
+            self._wait_response(i2c, signature, EXEC_TIME[OP_SIGN])
+        self._end_command()
         return signature
 
     def write_config(self, data):
@@ -433,11 +561,17 @@ class ATECC:
         :param bytearray data: Configuration data to-write
         """
         # First 16 bytes of data are skipped, not writable
-        for i in range(16, 128, 4):
-            if i == 84:
-                # can't write
+        i = 16
+        while i < 128:
+            if i % 32 == 0 and not 64 <= i < 96:
+                # whole block, write it in a single transaction
+                self._write(0, i//4, data[i:i+32])
+                i += 32
                 continue
-            self._write(0, i//4, data[i:i+4])
+            if i != 84:
+                # bytes 84-87 can't be written
+                self._write(0, i//4, data[i:i+4])
+            i += 4
 
     def _write(self, zone, address, buffer):
         self.wakeup()
@@ -445,11 +579,11 @@ class ATECC:
             raise RuntimeError("Only 4 or 32-byte writes supported.")
         if len(buffer) == 32:
             zone |= 0x80
-        self._send_command(0x12, zone, address, buffer)
-        time.sleep(26/1000)
         status = bytearray(1)
-        self._get_response(status)
-        self.idle()
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_WRITE, zone, address, buffer)
+            self._wait_response(i2c, status, EXEC_TIME[OP_WRITE])
+        self._end_command()
 
     def _read(self, zone, address, buffer):
         self.wakeup()
@@ -457,88 +591,87 @@ class ATECC:
             raise RuntimeError("Only 4 and 32 byte reads supported")
         if len(buffer) == 32:
             zone |= 0x80
-        self._send_command(2, zone, address)
-        time.sleep(0.005)
-        self._get_response(buffer)
-        time.sleep(0.001)
-        self.idle()
+        with self._i2c_device as i2c:
+            self._send_command(i2c, OP_READ, zone, address)
+            self._wait_response(i2c, buffer, EXEC_TIME[OP_READ])
+        self._end_command()
 
-    def _send_command(self, opcode, param_1, param_2=0x00, data=''):
+    # pylint: disable=too-many-arguments
+    def _send_command(self, i2c, opcode, param_1, param_2=0x00, data=b""):
         """Sends a security command packet over i2c.
+        :param I2CDevice i2c: Device locked by the calling transaction.
         :param byte opcode: The command Opcode
         :param byte param_1: The first parameter
         :param byte param_2: The second parameter, can be two bytes.
-        :param byte param_3 data: Optional remaining input data.
+        :param bytes data: Optional remaining input data, any bytes-like object.
         """
         # assembling command packet
-        command_packet = bytearray(8+len(data))
-        # word address
-        command_packet[0] = 0x03
-        # i/o group: count
-        command_packet[1] = len(command_packet) - 1 # count
-        # security command packets
-        command_packet[2] = opcode
-        command_packet[3] = param_1
-        command_packet[4] = param_2 & 0xFF
-        command_packet[5] = param_2 >> 8
-        for i, cmd in enumerate(data):
-            command_packet[6+i] = cmd
+        packet_len = 8 + len(data)
+        command_packet = self._cmd_buf
+        # word address, i/o group: count, security command packet
+        pack_into("<BBBBH", command_packet, 0, 0x03, packet_len - 1,
+                  opcode, param_1, param_2)
+        if data:
+            command_packet[6:packet_len-2] = data
         if self._debug:
-            print("Command Packet Sz: ", len(command_packet))
-            print("\tSending:", [hex(i) for i in command_packet])
+            print("Command Packet Sz: ", packet_len)
+            print("\tSending:", [hex(i) for i in command_packet[:packet_len]])
         # Checksum, CRC16 verification
-        crc = self._at_crc(command_packet[1:-2])
-        command_packet[-1] = crc >> 8
-        command_packet[-2] = crc & 0xFF
+        crc = _at_crc(memoryview(command_packet)[1:packet_len-2])
+        pack_into("<H", command_packet, packet_len-2, crc)
+        i2c.write(command_packet, end=packet_len)
+    # pylint: enable=too-many-arguments
+
+    def _send_raw(self, i2c, command_packet):
+        """Sends a precomputed security command packet over i2c.
+        :param I2CDevice i2c: Device locked by the calling transaction.
+        :param bytes command_packet: Complete command packet, including CRC.
+        """
+        if self._debug:
+            print("\tSending:", [hex(i) for i in command_packet])
+        i2c.write(command_packet)
 
-        self.wakeup()
-        with self._i2c_device as i2c:
-            i2c.write(command_packet)
-        # small sleep
-        time.sleep(0.001)
+    def _wait_response(self, i2c, buf, exec_time):
+        """Polls the device for a command's response as soon as it
+        completes, rather than sleeping for its maximum execution time.
+        :param I2CDevice i2c: Device locked by the calling transaction.
+        :param bytearray buf: Response buffer.
+        :param int exec_time: Maximum command execution time, in milliseconds.
 
+        """
+        return self._get_response(buf, timeout=exec_time + _POLL_MARGIN, i2c=i2c)
 
-    def _get_response(self, buf, length=None, retries=20):
-        self.wakeup()
+    def _get_response(self, buf, length=None, timeout=20, i2c=None):
+        if i2c is None:
+            with self._i2c_device as device:
+                return self._get_response(buf, length, timeout, device)
         if length is None:
             length = len(buf)
-        response = bytearray(length+3)   # 1 byte header, 2 bytes CRC, len bytes data
-        with self._i2c_device as i2c:
-            for _ in range(retries):
-                try:
-                    i2c.readinto(response)
-                    break
-                except OSError:
-                    pass
-            else:
+        # 1 byte header, 2 bytes CRC, len bytes data
+        response = self._resp_buf
+        readinto = i2c.readinto
+        end = length + 3
+        deadline = _monotonic() + timeout * _CLOCK_MS
+        delay = _POLL_MIN_TIME
+        attempts = 0
+        while True:
+            try:
+                readinto(response, end=end)
+                break
+            except OSError:
+                # device NACKs while it is still executing a command
+                attempts += 1
+            # the timeout is measured, the attempt count only keeps
+            # a coarse float clock from jumping past it too early
+            if attempts >= timeout and _monotonic() > deadline:
                 raise RuntimeError("Failed to read data from chip")
+            time.sleep(delay)
+            delay = min(delay * 2, _POLL_TIME)
         if self._debug:
-            print("\tReceived: ", [hex(i) for i in response])
-        crc = response[-2] | (response[-1] << 8)
-        crc2 = self._at_crc(response[0:-2])
+            print("\tReceived: ", [hex(i) for i in response[:end]])
+        crc = unpack_from("<H", response, length+1)[0]
+        crc2 = _at_crc(response, length+1)
         if crc != crc2:
             raise RuntimeError("CRC Mismatch")
-        for i in range(length):
-            buf[i] = response[i+1]
+        buf[0:length] = memoryview(response)[1:length+1]
         return response[1]
-
-    @staticmethod
-    def _at_crc(data, length=None):
-        if length is None:
-            length = len(data)
-        if not data or not length:
-            return 0
-        polynom = 0x8005
-        crc = 0x0
-        for b in data:
-            for shift in range(8):
-                data_bit = 0
-                if b & (1<<shift):
-                    data_bit = 1
-                crc_bit = (crc >> 15) & 0x1
-                crc <<= 1
-                crc &= 0xFFFF
-                if data_bit != crc_bit:
-                    crc ^= polynom
-                    crc &= 0xFFFF
-        return crc & 0xFFFF
@@ -35,57 +35,48 @@ Implementation Notes
 * Adafruit CircuitPython firmware for the supported boards:
   https://github.com/adafruit/circuitpython/releases
 """
-import struct
+# Signature algorithm: SEQUENCE, OBJECT IDENTIFIER ECDSA with SHA256
+_SIG_ALG_HDR = b"\x30\x0a\x06\x08\x2a\x86\x48\xce\x3d\x04\x03\x02"
+# Subject public key info: SEQUENCE, SEQUENCE, OBJECT IDENTIFIER EC Public Key,
+# OBJECT IDENTIFIER PRIME 256 v1, BIT STRING of an uncompressed point
+_PUBKEY_HDR = (b"\x30\x59\x30\x13"
+               b"\x06\x07\x2a\x86\x48\xce\x3d\x02\x01"
+               b"\x06\x08\x2a\x86\x48\xce\x3d\x03\x01\x07\x03\x42\x00\x04")
+# Attribute types (2.5.4.x) of country, state or province, locality,
+# organization, organizational unit and common name, in that order
+_NAME_TYPES = (0x06, 0x08, 0x07, 0x0a, 0x0b, 0x03)
 
 # pylint: disable=invalid-name
+def _der_integer(signature, start):
+    """Returns the index of the first significant byte of the 32-byte
+    integer at signature[start] and the length of its DER value.
+    """
+    i = start
+    # strip leading zeros, keeping at least one byte
+    while i < start + 31 and signature[i] == 0x00:
+        i += 1
+    # a set high bit needs a zero pad to stay positive
+    return i, start + 32 - i + (signature[i] >> 7)
+
 def get_signature(signature, data):
     """Appends signature data to buffer."""
-    # Signature algorithm
-    data += b"\x30\x0a\x06\x08"
-    # ECDSA with SHA256
-    data += b"\x2a\x86\x48\xce\x3d\x04\x03\x02"
-    r = signature[0]
-    s = signature[32]
-    r_len = 32
-    s_len = 32
-
-    while (r == 0x00 and r_len > 1):
-        r += 1
-        r_len -= 1
-
-    while (s == 0x00 and s_len > 1):
-        s += 1
-        s_len -= 1
-
-    if r & 0x80:
-        r_len += 1
-
-    if s & 0x80:
-        s_len += 1
-
-    data += b"\x03" + struct.pack("B", r_len + s_len + 7) + b"\x00"
-
-    data += b"\x30" + struct.pack("B", r_len + s_len + 4)
-
-    data += b"\x02" + struct.pack("B", r_len)
-
-    if r & 0x80:
+    data += _SIG_ALG_HDR
+    sig_mv = memoryview(signature)
+    r_start, r_len = _der_integer(signature, 0)
+    s_start, s_len = _der_integer(signature, 32)
+
+    # BIT STRING -> SEQUENCE -> INTEGER r
+    data += bytes((0x03, r_len + s_len + 7, 0x00,
+                   0x30, r_len + s_len + 4,
+                   0x02, r_len))
+    if signature[r_start] & 0x80:
         data += b"\x00"
-        r_len -= 1
-    data += signature[0:r_len]
-
-    if r & 0x80:
-        r_len += 1
-
-    data += b"\x02" + struct.pack("B", s_len)
-    if s & 0x80:
+    data += sig_mv[r_start:32]
+    # INTEGER s
+    data += bytes((0x02, s_len))
+    if signature[s_start] & 0x80:
         data += b"\x00"
-        s_len -= 1
-
-    data += signature[s_len:]
-
-    if s & 0x80:
-        s_len += 1
+    data += sig_mv[s_start:64]
 
     return 21 + r_len + s_len
 
@@ -94,37 +85,26 @@ def get_signature(signature, data):
 def get_issuer_or_subject(data, country, state_prov, locality,
                           org, org_unit, common):
     """Appends issuer or subject, if they exist, to data."""
-    if country:
-        get_name(country, 0x06, data)
-    if state_prov:
-        get_name(state_prov, 0x08, data)
-    if locality:
-        get_name(locality, 0x07, data)
-    if org:
-        get_name(org, 0x0a, data)
-    if org_unit:
-        get_name(org_unit, 0x0b, data)
-    if common:
-        get_name(common, 0x03, data)
+    for obj_type, name in zip(_NAME_TYPES, (country, state_prov, locality,
+                                            org, org_unit, common)):
+        if name:
+            get_name(name, obj_type, data)
 
 
 def get_name(name, obj_type, data):
     """Appends ASN.1 string in form: set -> seq -> objid -> string
-    :param str name: String to append to buffer.
+    :param bytes name: Encoded string to append to buffer.
     :param int obj_type: Object identifier type.
     :param bytearray data: Buffer to write to.
     """
-    # ASN.1 SET
-    data += b"\x31" + struct.pack("B", len(name) + 9)
-    # ASN.1 SEQUENCE
-    data += b"\x30" + struct.pack("B", len(name) + 7)
-    # ASN.1 OBJECT IDENTIFIER
-    data += b"\x06\x03\x55\x04" + struct.pack("B", obj_type)
-
-    # ASN.1 PRINTABLE STRING
-    data += b"\x13" + struct.pack("B", len(name))
+    name_len = len(name)
+    # ASN.1 SET -> SEQUENCE -> OBJECT IDENTIFIER 2.5.4.obj_type -> PRINTABLE STRING
+    data += bytes((0x31, name_len + 9,
+                   0x30, name_len + 7,
+                   0x06, 0x03, 0x55, 0x04, obj_type,
+                   0x13, name_len))
     data.extend(name)
-    return len(name) + 11
+    return name_len + 11
 
 def get_version(data):
     """Appends X.509 version to data."""
@@ -133,25 +113,23 @@ def get_version(data):
     data += b"\x02\x01\x00"
 
 def get_sequence_header(length, data):
-    """Appends sequence header to provided data."""
-    data += b"\x30"
+    """Appends sequence header to provided data.
+    Returns the length of the header, as get_sequence_header_length.
+    """
     if length > 255:
-        data += b"\x82"
-        data.append((length >> 8) & 0xff)
-    elif length > 127:
-        data += b"\x81"
-    length_byte = struct.pack("B", (length) & 0xff)
-    data += length_byte
+        data += b"\x30\x82"
+        data += length.to_bytes(2, "big")
+        return 4
+    if length > 127:
+        data += bytes((0x30, 0x81, length))
+        return 3
+    data += bytes((0x30, length))
+    return 2
 
 
 def get_public_key(data, public_key):
     """Appends public key subject and object identifiers."""
-    # Subject: Public Key
-    data += b"\x30" + struct.pack("B", (0x59) & 0xff) + b"\x30\x13"
-    # Object identifier: EC Public Key
-    data += b"\x06\x07\x2a\x86\x48\xce\x3d\x02\x01"
-    # Object identifier: PRIME 256 v1
-    data += b"\x06\x08\x2a\x86\x48\xce\x3d\x03\x01\x07\x03\x42\x00\x04"
+    data += _PUBKEY_HDR
     # Extend the buffer by the public key
     data += public_key
 
@@ -159,24 +137,8 @@ def get_signature_length(signature):
     """Return length of ECDSA signature.
     :param bytearray signature: Signed SHA256 hash.
     """
-    r = signature[0]
-    s = signature[32]
-    r_len = 32
-    s_len = 32
-
-    while (r == 0x00 and r_len > 1):
-        r += 1
-        r_len -= 1
-
-    if r & 0x80:
-        r_len += 1
-
-    while (s == 0x00 and s_len > 1):
-        s += 1
-        s_len -= 1
-
-    if s & 0x80:
-        s_len += 1
+    r_len = _der_integer(signature, 0)[1]
+    s_len = _der_integer(signature, 32)[1]
     return 21 + r_len + s_len
 
 def get_sequence_header_length(seq_header_len):
@@ -189,19 +151,8 @@ def get_sequence_header_length(seq_header_len):
 
 def issuer_or_subject_length(country, state_prov, city, org, org_unit, common):
     """Returns total length of provided certificate information."""
-    tot_len = 0
-    if country:
-        tot_len += 11 + len(country)
-    if state_prov:
-        tot_len += 11 + len(state_prov)
-    if city:
-        tot_len += 11 + len(city)
-    if org:
-        tot_len += 11 + len(org)
-    if org_unit:
-        tot_len += 11 + len(org_unit)
-    if common:
-        tot_len += 11 + len(common)
-    else:
+    if not common:
         raise TypeError("Provided length must be > 0")
-    return tot_len
+    # each name is wrapped in 11 bytes of SET/SEQUENCE/OID/STRING headers
+    return sum(11 + len(field) for field in
+               (country, state_prov, city, org, org_unit, common) if field)
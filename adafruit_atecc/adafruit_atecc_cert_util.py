@@ -37,6 +37,27 @@ Implementation Notes
 """
 from adafruit_binascii import b2a_base64
 import adafruit_atecc.adafruit_atecc_asn1 as asn1
+try:
+    from hashlib import sha256
+except ImportError:
+    try:
+        # CircuitPython's hashlib only provides new()
+        from hashlib import new as _hashlib_new
+
+        def sha256(data):
+            """Returns a SHA-256 hash object of data."""
+            return _hashlib_new("sha256", data)
+    except ImportError:
+        # no software SHA-256, use the ATECC's SHA engine
+        sha256 = None  # pylint: disable=invalid-name
+
+def _encode(value):
+    """Returns a subject field as bytes, empty if it is not set."""
+    if not value:
+        return b""
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return bytes(value)
 
 class CSR:
     """Certificate Signing Request Builder.
@@ -57,15 +78,21 @@ class CSR:
         self._atecc = atecc
         self.private_key = private_key
         self._slot = slot_num
-        self._country = country
-        self._state_province = state_prov
-        self._locality = city
-        self._org = org
-        self._org_unit = org_unit
-        self._common = self._atecc.serial_number
+        # the subject is fixed from here on, so encode it only once,
+        # as bytes so its lengths are byte counts
+        names = (_encode(country), _encode(state_prov), _encode(city),
+                 _encode(org), _encode(org_unit), _encode(self._atecc.serial_number))
+        subject_len = asn1.issuer_or_subject_length(*names)
+        self._subject = bytearray()
+        asn1.get_sequence_header(subject_len, self._subject)
+        asn1.get_issuer_or_subject(self._subject, *names)
         self._version_len = 3
         self._cert = None
         self._key = None
+        # last csr_info and its digest, with the public key they were built for
+        self._csr_info_key = None
+        self._csr_info = None
+        self._csr_info_digest = None
 
     def generate_csr(self):
         """Generates and returns a certificate signing request."""
@@ -88,59 +115,57 @@ class CSR:
     def _csr_end(self):
         """Generates and returns
         a certificate signing request as a base64 string."""
-        len_issuer_subject = asn1.issuer_or_subject_length(self._country, self._state_province,
-                                                           self._locality, self._org,
-                                                           self._org_unit, self._common)
-        len_sub_header = asn1.get_sequence_header_length(len_issuer_subject)
-
-        len_csr_info = self._version_len + len_issuer_subject
-        len_csr_info += len_sub_header + 91 + 2
+        # version, subject (with its header), public key and terminator
+        len_csr_info = self._version_len + len(self._subject) + 91 + 2
         len_csr_info_header = asn1.get_sequence_header_length(len_csr_info)
 
-        # CSR Info Packet
-        csr_info = bytearray()
-
-        # Append CSR Info --> [0:2]
-        asn1.get_sequence_header(len_csr_info, csr_info)
-
-        # Append Version --> [3:5]
-        asn1.get_version(csr_info)
-
-        # Append Subject --> [6:7]
-        asn1.get_sequence_header(len_issuer_subject, csr_info)
+        # csr_info only depends on the public key, reuse it and its digest
+        # when the slot's key hasn't changed since the last CSR
+        if self._csr_info_key != self._key:
+            # CSR Info Packet
+            csr_info = bytearray()
 
-        # Append Issuer or Subject
-        asn1.get_issuer_or_subject(csr_info, self._country, self._state_province,
-                                   self._locality, self._org, self._org_unit, self._common)
+            # Append CSR Info --> [0:2]
+            asn1.get_sequence_header(len_csr_info, csr_info)
 
-        # Append Public Key
-        asn1.get_public_key(csr_info, self._key)
+            # Append Version --> [3:5]
+            asn1.get_version(csr_info)
 
-        # Terminator
-        csr_info += b"\xa0\x00"
+            # Append Subject --> [6:]
+            csr_info += self._subject
 
-        # Init. SHA-256 Calculation
-        csr_info_sha_256 = bytearray(64)
-        self._atecc.sha_start()
+            # Append Public Key
+            asn1.get_public_key(csr_info, self._key)
 
-        for i in range(0, len_csr_info + len_csr_info_header, 64):
-            chunk_len = (len_csr_info_header + len_csr_info) - i
+            # Terminator
+            csr_info += b"\xa0\x00"
 
-            if chunk_len > 64:
-                chunk_len = 64
-            if chunk_len == 64:
-                self._atecc.sha_update(csr_info[i:i+64])
+            # Init. SHA-256 Calculation
+            if sha256:
+                # hashing locally saves an I2C round trip per 64-byte block
+                csr_info_sha_256 = sha256(csr_info).digest()
             else:
-                csr_info_sha_256 = self._atecc.sha_digest(csr_info[i:])
+                csr_info_mv = memoryview(csr_info)
+                # full 64-byte blocks in one call, the remainder with the digest
+                blocks_len = len(csr_info) - len(csr_info) % 64
+                # keep the chip awake between the SHA commands
+                with self._atecc:
+                    self._atecc.sha_start()
+                    if blocks_len:
+                        self._atecc.sha_update(csr_info_mv[:blocks_len])
+                    csr_info_sha_256 = self._atecc.sha_digest(csr_info_mv[blocks_len:])
+            self._csr_info_key = bytes(self._key)
+            self._csr_info = csr_info
+            self._csr_info_digest = csr_info_sha_256
+        csr_info = self._csr_info
+        csr_info_sha_256 = self._csr_info_digest
 
         # Sign the SHA256 Digest
-        signature = bytearray(64)
         signature = self._atecc.ecdsa_sign(self._slot, csr_info_sha_256)
 
         # Calculations for signature and csr length
         len_signature = asn1.get_signature_length(signature)
         len_csr = len_csr_info_header + len_csr_info + len_signature
-        asn1.get_sequence_header_length(len_csr)
 
         # append signature to csr
         csr = bytearray()
@@ -1,10 +1,18 @@
 # testing adafruit atecc module
 import board
-import adafruit_atecc
 import busio
+from adafruit_atecc.adafruit_atecc import ATECC
 
 
-_WAKE_CLK_FREQ = 100000 # slower clock speed 	
+_WAKE_CLK_FREQ = 100000 # slower clock speed
 i2c = busio.I2C(board.SCL, board.SDA, frequency=_WAKE_CLK_FREQ)
 
-adafruit_atecc.ATECCx08A(i2c)
\ No newline at end of file
+atecc = ATECC(i2c)
+
+print("ATECC Serial: ", atecc.serial_number)
+
+# Keep the chip awake across several commands,
+# it idles once at the end of the with block
+with atecc:
+    print("Random Value: ", atecc.random(rnd_max=255))
+    print("ATECC Counter #1 Value: ", atecc.counter(1, increment_counter=True))